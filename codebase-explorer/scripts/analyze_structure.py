@@ -12,8 +12,13 @@ Usage:
     analyze_structure.py [project_path] [--max-depth N] [--include-hidden]
 """
 
+import hashlib
+import mmap
 import os
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple
 import json
@@ -52,162 +57,476 @@ KEY_DIRECTORIES = {
     'vendor': 'Third-party dependencies',
 }
 
+# Lowercased key directory names for membership tests
+_KEY_DIR_SET = frozenset(name.lower() for name in KEY_DIRECTORIES)
+
 # File extensions to count as code
-CODE_EXTENSIONS = {
+CODE_EXTENSIONS = frozenset({
     'py', 'js', 'ts', 'jsx', 'tsx', 'vue', 'svelte',
     'java', 'kt', 'kts', 'go', 'rs', 'c', 'cpp', 'h', 'hpp',
     'cs', 'swift', 'rb', 'php', 'scala', 'dart',
     'html', 'css', 'scss', 'sass', 'less',
     'json', 'yaml', 'yml', 'xml', 'toml', 'ini',
-}
+})
+
+# Common generated directories that are listed but not descended into
+_SKIP_DIRS = frozenset({'node_modules', '__pycache__', '.git', 'dist', 'build', '.next', '.nuxt'})
+
+# Maximum number of files being read concurrently when counting lines
+MAX_IN_FLIGHT_READS = 128
+
+# Files larger than this (likely minified or generated) are not line counted
+MAX_COUNT_BYTES = 5 << 20
+
+# Largest single read when counting lines
+MAX_READ_CHUNK = 16 << 20
+
+# Files at least this large are memory-mapped instead of read
+MMAP_MIN_SIZE = 64 << 10
+MMAP_SLICE = 1 << 20
+
+# Top-level subdirectories are analyzed in worker processes above this count
+PARALLEL_MIN_SUBDIRS = 4
+
+# Persistent line count cache, one file per project root:
+# "dev:ino" -> [mtime_ns, size, line_count]
+LINE_CACHE_DIR = Path(
+    os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+) / 'analyze_structure'
+
+# A file modified this recently is "racily clean": a rewrite in the same
+# timestamp tick at the same size would leave its mtime unchanged. Its count
+# is not cached, so the next run reads it again.
+RACY_WINDOW_NS = 2 * 10**9
+
+_line_cache_file = None
+_line_cache = {}
+# Entries looked up or added during this run; only these are saved, so
+# files that were deleted or replaced (e.g. by rename-on-save editors)
+# drop out of the cache instead of accumulating
+_line_cache_used = {}
+_line_cache_dirty = False
+
+
+def load_line_cache(project_path: Path) -> None:
+    """Load cached line counts for a project from previous runs."""
+    global _line_cache, _line_cache_file
+    root = os.path.abspath(project_path).encode('utf-8', 'surrogateescape')
+    _line_cache_file = LINE_CACHE_DIR / f'{hashlib.sha1(root).hexdigest()}.json'
+    try:
+        with open(_line_cache_file, 'rb') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            _line_cache = data
+    except (OSError, ValueError):
+        pass
+
+
+def save_line_cache() -> None:
+    """Atomically replace the project's cache with this run's line counts."""
+    if _line_cache_file is None:
+        return
+    if not _line_cache_dirty and len(_line_cache_used) == len(_line_cache):
+        return
+    tmp_file = _line_cache_file.with_name(f'{_line_cache_file.name}.{os.getpid()}.tmp')
+    try:
+        LINE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w') as f:
+            json.dump(_line_cache_used, f)
+        os.replace(tmp_file, _line_cache_file)
+    except OSError:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
 
 
 def count_lines(file_path: Path) -> int:
-    """Count lines in a file."""
+    """
+    Count lines in a file, reusing the cached count if it is unchanged.
+
+    Returns -1 for files over MAX_COUNT_BYTES, which are not read.
+    """
+    global _line_cache_dirty
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return sum(1 for _ in f)
-    except Exception:
+        st = os.stat(file_path)
+    except OSError:
         return 0
 
+    if st.st_size > MAX_COUNT_BYTES:
+        return -1
+
+    key = f"{st.st_dev}:{st.st_ino}"
+    cached = _line_cache.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        _line_cache_used[key] = cached
+        return cached[2]
+
+    lines = _count_newlines(file_path, st.st_size)
+    if lines is None:
+        return 0
+
+    if st.st_mtime_ns < time.time_ns() - RACY_WINDOW_NS:
+        _line_cache_used[key] = [st.st_mtime_ns, st.st_size, lines]
+        _line_cache_dirty = True
+    return lines
+
+
+def _count_newlines(file_path: Path, size: int) -> int:
+    """Count newline-terminated lines in a file (None on error)."""
+    try:
+        fd = os.open(str(file_path), os.O_RDONLY)
+    except OSError:
+        return None
+
+    try:
+        if size >= MMAP_MIN_SIZE:
+            # Count straight from the page cache, without read syscalls
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    total = sum(
+                        mm[i:i + MMAP_SLICE].count(b'\n')
+                        for i in range(0, len(mm), MMAP_SLICE)
+                    )
+                    return total + (1 if mm[-1:] != b'\n' else 0)
+            except ValueError:
+                pass  # File was truncated to empty since the stat
+        return _read_newlines(fd, size)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def _read_newlines(fd: int, size: int) -> int:
+    """Count lines from an open file descriptor with os.read."""
+    # Size the read from the stat so most files need a single os.read; a
+    # short read means end of file, saving the extra empty read
+    chunk_size = min(size + 1, MAX_READ_CHUNK)
+    total = 0
+    last = b'\n'
+    while True:
+        buf = os.read(fd, chunk_size)
+        if not buf:
+            break
+        total += buf.count(b'\n')
+        last = buf[-1:]
+        if len(buf) < chunk_size:
+            break
+
+    # A final line without a trailing newline still counts
+    return total + (1 if last != b'\n' else 0)
+
+
+def new_stats() -> Dict:
+    """Create an empty file statistics dict."""
+    return {
+        'total_files': 0,
+        'code_files': 0,
+        'total_lines': 0,
+        'directories': 0,
+        'by_language': {},
+    }
+
+
+def count_code_lines(structure: Dict, stats: Dict = None) -> None:
+    """
+    Fill in line counts for every code file in an analyzed tree.
+
+    File reads are batched across a bounded pool of worker threads (the
+    GIL is released while blocked in os.read), then directory totals are
+    re-accumulated from their children. When a stats dict is given, the
+    file statistics are gathered in the same pass.
+    """
+    code_files = []
+    code_exts = []
+    directories = []  # Parents always precede their children
+    total_files = 0
+
+    stack = [structure]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            continue
+        if node['type'] == 'dir':
+            directories.append(node)
+            stack.extend(reversed(node['children']))
+        else:
+            total_files += 1
+            ext = os.path.splitext(node['name'])[1].lstrip('.').lower()
+            if ext in CODE_EXTENSIONS:
+                code_files.append(node)
+                code_exts.append(ext)
+
+    if code_files:
+        workers = min(MAX_IN_FLIGHT_READS, len(code_files), (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            counts = executor.map(count_lines, [node['path'] for node in code_files])
+            for node, lines in zip(code_files, counts):
+                node['line_count'] = lines
+
+    # Children are summed before their parents by walking in reverse
+    for node in reversed(directories):
+        node['line_count'] = sum(
+            max(child['line_count'], 0)
+            for child in node['children'] if not isinstance(child, str)
+        )
+
+    if stats is not None:
+        by_language = Counter(stats['by_language'])
+        for node, ext in zip(code_files, code_exts):
+            lines = node['line_count']
+            if lines > 0:
+                stats['code_files'] += 1
+                stats['total_lines'] += lines
+                by_language[ext] += lines
+        stats['total_files'] += total_files
+        stats['directories'] += len(directories)
+        stats['by_language'] = dict(by_language)
+
 
 def analyze_directory(
     root_path: Path,
     max_depth: int = 3,
     include_hidden: bool = False,
-    current_depth: int = 0
+    current_depth: int = 0,
+    stats: Dict = None
 ) -> Dict:
     """
-    Recursively analyze directory structure.
+    Analyze directory structure.
 
     Returns dict with:
     - name: Directory/file name
     - type: 'dir' or 'file'
     - path: Relative path from root
     - children: List of child items (for directories)
-    - line_count: Line count (for code files)
+    - line_count: Line count (for code files; -1 if too large to count)
     - is_key: Whether this is a key directory
+
+    If a stats dict (see new_stats) is given, file statistics are filled
+    in while the tree is built.
     """
-    if current_depth > max_depth:
-        return None
+    return _analyze_path(
+        str(root_path), root_path.name, root_path.is_dir(),
+        max_depth, include_hidden, current_depth, stats,
+    )
 
-    result = {
-        'name': root_path.name,
-        'type': 'dir' if root_path.is_dir() else 'file',
-        'path': str(root_path),
+
+def _new_node(path: str, name: str, is_dir: bool, include_hidden: bool) -> Tuple[Dict, bool]:
+    """
+    Build the node for a single path.
+
+    Returns (node, expand) where expand says whether the node's children
+    still need to be listed, or None if the path is excluded.
+    """
+    node = {
+        'name': name,
+        'type': 'dir' if is_dir else 'file',
+        'path': path,
         'children': [],
         'line_count': 0,
         'is_key': False,
     }
 
-    if root_path.is_dir():
-        # Check if this is a key directory
-        result['is_key'] = root_path.name.lower() in KEY_DIRECTORIES
+    if not is_dir:
+        return node, False
+
+    # Check if this is a key directory
+    node['is_key'] = name.lower() in _KEY_DIR_SET
+
+    # Skip hidden directories unless requested
+    if not include_hidden and name.startswith('.') and name != '.':
+        return None
+
+    # Skip common generated directories
+    if name in _SKIP_DIRS:
+        node['children'] = ['<skipped>']
+        return node, False
+
+    return node, True
+
+
+def _list_entries(path: str) -> List[Tuple[str, str, bool]]:
+    """List (path, name, is_dir) entries, directories first, using os.scandir."""
+    # DirEntry.is_dir() reuses the d_type from readdir instead of a stat()
+    with os.scandir(path) as it:
+        return sorted(
+            ((e.path, e.name, e.is_dir(follow_symlinks=False)) for e in it),
+            key=lambda x: (not x[2], x[1]),
+        )
+
 
-        # Skip hidden directories unless requested
-        if not include_hidden and root_path.name.startswith('.') and root_path.name != '.':
-            return None
+def _analyze_path(
+    path: str,
+    name: str,
+    is_dir: bool,
+    max_depth: int,
+    include_hidden: bool,
+    current_depth: int,
+    stats: Dict = None
+) -> Dict:
+    """Analyze a path, walking directories with an explicit stack."""
+    if current_depth > max_depth:
+        return None
 
-        # Skip common generated directories
-        skip_dirs = {'node_modules', '__pycache__', '.git', 'dist', 'build', '.next', '.nuxt'}
-        if root_path.name in skip_dirs:
-            result['children'] = ['<skipped>']
-            return result
+    made = _new_node(path, name, is_dir, include_hidden)
+    if made is None:
+        return None
+    result, expand = made
+
+    pending = [(result, current_depth)] if expand else []
+    while pending:
+        node, depth = pending.pop()
+        if depth >= max_depth:
+            continue
 
-        # Process children
         try:
-            items = sorted(root_path.iterdir(), key=lambda x: (not x.is_dir(), x.name))
-            for item in items:
-                child = analyze_directory(item, max_depth, include_hidden, current_depth + 1)
-                if child:
-                    result['children'].append(child)
-                    result['line_count'] += child.get('line_count', 0)
+            entries = _list_entries(node['path'])
         except PermissionError:
-            result['children'] = ['<permission denied>']
-    else:
-        # Count lines for code files
-        ext = root_path.suffix.lstrip('.').lower()
-        if ext in CODE_EXTENSIONS:
-            result['line_count'] = count_lines(root_path)
+            node['children'] = ['<permission denied>']
+            continue
+
+        if depth == 0:
+            node['children'] = [
+                child for child in analyze_top_level(entries, max_depth, include_hidden) if child
+            ]
+            continue
+
+        for entry in entries:
+            made = _new_node(*entry, include_hidden)
+            if made is None:
+                continue
+            child, expand = made
+            node['children'].append(child)
+            if expand:
+                pending.append((child, depth + 1))
+
+    # Code file lines are counted in one batch once the tree is built
+    if current_depth == 0:
+        count_code_lines(result, stats)
 
     return result
 
 
-def generate_text_tree(structure: Dict, prefix: str = '', is_last: bool = True) -> str:
-    """Generate ASCII directory tree."""
-    lines = []
-    connector = '└── ' if is_last else '├── '
-    lines.append(f"{prefix}{connector}{structure['name']}")
-
-    # Add metadata for directories
-    if structure['type'] == 'dir':
-        if structure['is_key']:
-            key_desc = KEY_DIRECTORIES.get(structure['name'].lower(), '')
-            lines.append(f"{prefix}{'    ' if is_last else '│   '}# {key_desc}")
-
-    # Process children
-    children = structure.get('children', [])
-    extension = '    ' if is_last else '│   '
-
-    for i, child in enumerate(children):
-        if isinstance(child, str):
-            # Special markers like '<skipped>'
-            lines.append(f"{prefix}{extension}{child}")
-        else:
-            is_last_child = (i == len(children) - 1)
-            lines.append(generate_text_tree(child, prefix + extension, is_last_child))
+def _analyze_subtree(entry: Tuple[str, str, bool], max_depth: int, include_hidden: bool) -> Dict:
+    """Analyze one top-level child of the project (runs in a worker process)."""
+    return _analyze_path(*entry, max_depth, include_hidden, current_depth=1)
 
-    return '\n'.join(lines)
 
+def analyze_top_level(
+    entries: List[Tuple[str, str, bool]],
+    max_depth: int,
+    include_hidden: bool
+) -> List[Dict]:
+    """
+    Analyze the top-level (path, name, is_dir) entries of the project, in order.
 
-def generate_mermaid_tree(structure: Dict, indent: int = 0) -> str:
-    """Generate Mermind tree diagram."""
-    lines = []
-    prefix = '  ' * indent
+    When there are enough subdirectories, each one is sharded to a worker
+    process; otherwise (or if processes are unavailable) they are walked
+    serially in this process.
+    """
+    subdirs = [entry for entry in entries if entry[2]]
 
-    if structure['type'] == 'dir':
-        lines.append(f"{prefix}{structure['name']}")
-        for child in structure.get('children', []):
-            if isinstance(child, str):
-                continue  # Skip special markers
-            lines.append(generate_mermaid_tree(child, indent + 1))
-    else:
-        # Add line count for code files
-        line_info = f" ({structure['line_count']} lines)" if structure['line_count'] > 0 else ''
-        lines.append(f"{prefix}{structure['name']}{line_info}")
+    if len(subdirs) > PARALLEL_MIN_SUBDIRS:
+        try:
+            with ProcessPoolExecutor(max_workers=min(len(subdirs), os.cpu_count() or 1)) as executor:
+                subtrees = dict(zip(subdirs, executor.map(
+                    _analyze_subtree,
+                    subdirs,
+                    [max_depth] * len(subdirs),
+                    [include_hidden] * len(subdirs),
+                )))
+            return [
+                subtrees[entry] if entry in subtrees
+                else _analyze_subtree(entry, max_depth, include_hidden)
+                for entry in entries
+            ]
+        except (OSError, NotImplementedError):
+            pass
+
+    return [_analyze_subtree(entry, max_depth, include_hidden) for entry in entries]
 
-    return '\n'.join(lines)
 
+def generate_text_tree(structure: Dict, prefix: str = '', is_last: bool = True) -> str:
+    """Generate ASCII directory tree."""
+    out = []
+    # Stack items are either a node to emit or an already formatted line
+    stack = [(structure, prefix, is_last)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+            continue
+
+        node, prefix, is_last = item
+        connector = '└── ' if is_last else '├── '
+        out.append(f"{prefix}{connector}{node['name']}")
+
+        # Add metadata for directories
+        extension = '    ' if is_last else '│   '
+        if node['type'] == 'dir' and node['is_key']:
+            key_desc = KEY_DIRECTORIES.get(node['name'].lower(), '')
+            out.append(f"{prefix}{extension}# {key_desc}")
+
+        # Push children in reverse so they are emitted in order
+        children = node.get('children', [])
+        last_index = len(children) - 1
+        for i in range(last_index, -1, -1):
+            child = children[i]
+            if isinstance(child, str):
+                # Special markers like '<skipped>'
+                stack.append(f"{prefix}{extension}{child}")
+            else:
+                stack.append((child, prefix + extension, i == last_index))
 
-def calculate_stats(structure: Dict) -> Dict:
-    """Calculate file statistics."""
-    stats = {
-        'total_files': 0,
-        'code_files': 0,
-        'total_lines': 0,
-        'directories': 0,
-        'by_language': {},
-    }
+    return '\n'.join(out)
 
-    def traverse(node):
-        if isinstance(node, str):
-            return
+
+def generate_mermaid_tree(structure: Dict, indent: int = 0) -> str:
+    """Generate Mermind tree diagram."""
+    out = []
+    stack = [(structure, indent)]
+    while stack:
+        node, indent = stack.pop()
+        prefix = '  ' * indent
 
         if node['type'] == 'dir':
-            stats['directories'] += 1
-            for child in node.get('children', []):
-                traverse(child)
+            out.append(f"{prefix}{node['name']}")
+            for child in reversed(node.get('children', [])):
+                if isinstance(child, str):
+                    continue  # Skip special markers
+                stack.append((child, indent + 1))
         else:
-            stats['total_files'] += 1
+            # Add line count for code files
             if node['line_count'] > 0:
-                stats['code_files'] += 1
-                stats['total_lines'] += node['line_count']
+                line_info = f" ({node['line_count']} lines)"
+            elif node['line_count'] < 0:
+                line_info = ' (too large to count)'
+            else:
+                line_info = ''
+            out.append(f"{prefix}{node['name']}{line_info}")
+
+    return '\n'.join(out)
 
-                ext = Path(node['path']).suffix.lstrip('.').lower()
-                stats['by_language'][ext] = stats['by_language'].get(ext, 0) + node['line_count']
 
-    traverse(structure)
-    return stats
+def write_json(output_file: Path, data: Dict) -> None:
+    """Write data as indented JSON, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        try:
+            output_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
+        except orjson.JSONEncodeError:
+            pass  # e.g. nesting deeper than orjson supports
+
+    # Write UTF-8 unescaped, byte-for-byte like orjson; lone surrogates from
+    # undecodable file names become \udcXX escapes, as json would write them
+    with open(output_file, 'w', encoding='utf-8', errors='backslashreplace') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
 
 
 def main():
@@ -240,11 +559,12 @@ def main():
 
     print(f"📁 Analyzing: {project_path}\n")
 
-    # Analyze structure
-    structure = analyze_directory(project_path, max_depth, include_hidden)
-
-    # Calculate statistics
-    stats = calculate_stats(structure)
+    # Analyze structure, gathering statistics in the same pass and reusing
+    # line counts from earlier runs
+    stats = new_stats()
+    load_line_cache(project_path)
+    structure = analyze_directory(project_path, max_depth, include_hidden, stats=stats)
+    save_line_cache()
 
     # Output results
     print("=" * 60)
@@ -273,11 +593,10 @@ def main():
 
     # Also output as JSON for programmatic use
     output_file = project_path / '.codebase-structure.json'
-    with open(output_file, 'w') as f:
-        json.dump({
-            'structure': structure,
-            'stats': stats
-        }, f, indent=2)
+    write_json(output_file, {
+        'structure': structure,
+        'stats': stats
+    })
 
     print(f"\n✅ Structure saved to: {output_file}")
 
@@ -16,6 +16,8 @@ import os
 import sys
 import json
 import re
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Tuple, Set
 
@@ -120,6 +122,38 @@ FRAMEWORK_PATTERNS = {
 }
 
 
+def _build_framework_index() -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]], List[int]]:
+    """Index FRAMEWORK_PATTERNS into exact names and wildcard prefixes."""
+    exact = {}
+    prefixes = {}
+    for framework, patterns in FRAMEWORK_PATTERNS.items():
+        for pattern in patterns:
+            if '*' in pattern:
+                prefixes.setdefault(pattern.replace('*', ''), set()).add(framework)
+            else:
+                exact.setdefault(pattern, set()).add(framework)
+    return exact, prefixes, sorted({len(prefix) for prefix in prefixes})
+
+
+_FRAMEWORK_EXACT, _FRAMEWORK_PREFIXES, _FRAMEWORK_PREFIX_LENGTHS = _build_framework_index()
+
+
+# requirements.txt line: (full requirement, package name before version specifiers)
+_REQUIREMENT_RE = re.compile(rb'(?m)^[ \t]*(([^#<>=!~\s][^<>=!~\s]*)[^\r\n]*)')
+
+# go.mod require directive: either a parenthesized block or a single module
+_GO_REQUIRE_RE = re.compile(
+    rb'(?ms)^[ \t]*require[ \t]*(?:\((?P<block>.*?)^[ \t]*\)|(?P<module>[^\s(]\S*)[ \t]+(?P<version>\S+))'
+)
+# go.mod require block line: module version (comment lines are skipped)
+_GO_MODULE_RE = re.compile(rb'(?m)^[ \t]*([^\s/()]\S*)[ \t]+(\S+)')
+
+# Cargo.toml [dependencies] table body, up to the next table header
+_CARGO_DEPS_RE = re.compile(rb'(?ms)^[ \t]*\[dependencies\][^\r\n]*\r?$(.*?)(?=^[ \t]*\[|\Z)')
+# Cargo.toml dependency line: (full line, crate name) for name = "version"
+_CARGO_DEP_RE = re.compile(rb'(?m)^[ \t]*((\w+)[ \t]*=[ \t]*["\'][^\r\n]*)')
+
+
 # Language detection by file extension
 LANGUAGE_EXTENSIONS = {
     'py': 'Python',
@@ -156,36 +190,42 @@ LANGUAGE_EXTENSIONS = {
 }
 
 
+# Directories never descended into when counting languages
+_SKIP_DIRS = frozenset({
+    'node_modules', '__pycache__', '.git', 'vendor',
+    'dist', 'build', '.next', '.nuxt', 'target', 'bin'
+})
+
+
 def detect_languages(project_path: Path) -> Dict[str, int]:
     """Detect languages by counting file extensions."""
-    language_counts = {}
+    language_counts = Counter()
 
     for root, dirs, files in os.walk(project_path):
         # Skip common ignore directories
-        dirs[:] = [d for d in dirs if d not in {
-            'node_modules', '__pycache__', '.git', 'vendor',
-            'dist', 'build', '.next', '.nuxt', 'target', 'bin'
-        }]
+        dirs[:] = [d for d in dirs if d not in _SKIP_DIRS]
 
-        for file in files:
-            ext = Path(file).suffix.lstrip('.').lower()
-            if ext in LANGUAGE_EXTENSIONS:
-                lang = LANGUAGE_EXTENSIONS[ext]
-                language_counts[lang] = language_counts.get(lang, 0) + 1
+        # Dotfiles like '.sh' have no suffix, matching Path.suffix
+        language_counts.update(filter(None, (
+            LANGUAGE_EXTENSIONS.get(file[i + 1:].lower())
+            for file in files
+            if (i := file.rfind('.')) > 0
+        )))
 
-    return language_counts
+    return dict(language_counts)
 
 
 def parse_package_json(file_path: Path) -> Dict:
     """Parse package.json and extract dependencies."""
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        # json.loads detects the encoding from raw bytes, skipping the text layer
+        data = json.loads(Path(file_path).read_bytes())
 
         deps = {}
         for key in ['dependencies', 'devDependencies', 'peerDependencies']:
-            if key in data:
-                deps.update(data[key])
+            section = data.get(key)
+            if isinstance(section, dict):
+                deps.update(section)
 
         return deps
     except Exception:
@@ -196,14 +236,10 @@ def parse_requirements_txt(file_path: Path) -> Dict:
     """Parse requirements.txt and extract packages."""
     deps = {}
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Extract package name (before version specifiers)
-                    package = re.split(r'[<>=!~\s]', line)[0].lower()
-                    if package:
-                        deps[package] = line
+        data = Path(file_path).read_bytes()
+        for match in _REQUIREMENT_RE.finditer(data):
+            package = match.group(2).decode('utf-8', 'ignore').lower()
+            deps[package] = match.group(1).decode('utf-8', 'ignore').strip()
     except Exception:
         pass
     return deps
@@ -213,20 +249,14 @@ def parse_go_mod(file_path: Path) -> Dict:
     """Parse go.mod and extract dependencies."""
     deps = {}
     try:
-        with open(file_path, 'r') as f:
-            in_require = False
-            for line in f:
-                line = line.strip()
-                if line.startswith('require'):
-                    in_require = True
-                    continue
-                if in_require:
-                    if line == ')':
-                        break
-                    # Parse: package version
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        deps[parts[0]] = parts[1]
+        data = Path(file_path).read_bytes()
+        for require in _GO_REQUIRE_RE.finditer(data):
+            if require.group('block') is not None:
+                modules = _GO_MODULE_RE.findall(require.group('block'))
+            else:
+                modules = [(require.group('module'), require.group('version'))]
+            for module, version in modules:
+                deps[module.decode('utf-8', 'ignore')] = version.decode('utf-8', 'ignore')
     except Exception:
         pass
     return deps
@@ -236,20 +266,11 @@ def parse_cargo_toml(file_path: Path) -> Dict:
     """Parse Cargo.toml and extract dependencies."""
     deps = {}
     try:
-        with open(file_path, 'r') as f:
-            in_deps = False
-            for line in f:
-                line = line.strip()
-                if line.startswith('[dependencies]'):
-                    in_deps = True
-                    continue
-                if in_deps:
-                    if line.startswith('['):
-                        break
-                    # Parse: package = "version"
-                    match = re.match(r'^(\w+)\s*=\s*["\']', line)
-                    if match:
-                        deps[match.group(1)] = line
+        data = Path(file_path).read_bytes()
+        section = _CARGO_DEPS_RE.search(data)
+        if section:
+            for line, name in _CARGO_DEP_RE.findall(section.group(1)):
+                deps[name.decode('utf-8', 'ignore')] = line.decode('utf-8', 'ignore').strip()
     except Exception:
         pass
     return deps
@@ -257,28 +278,33 @@ def parse_cargo_toml(file_path: Path) -> Dict:
 
 def detect_frameworks(dependencies: Dict) -> List[str]:
     """Detect frameworks from dependencies."""
-    frameworks = []
+    frameworks = set()
 
-    for framework, patterns in FRAMEWORK_PATTERNS.items():
-        for pattern in patterns:
-            # Pattern can be exact match or wildcard
-            if '*' in pattern:
-                prefix = pattern.replace('*', '')
-                if any(dep.startswith(prefix) for dep in dependencies.keys()):
-                    frameworks.append(framework)
-                    break
-            else:
-                if pattern in dependencies:
-                    frameworks.append(framework)
-                    break
+    # One pass over the dependencies; wildcard patterns are matched by
+    # looking up each distinct prefix length in the prefix index
+    for dep in dependencies:
+        frameworks.update(_FRAMEWORK_EXACT.get(dep, ()))
+        for length in _FRAMEWORK_PREFIX_LENGTHS:
+            frameworks.update(_FRAMEWORK_PREFIXES.get(dep[:length], ()))
+
+    return sorted(frameworks)
 
-    return sorted(set(frameworks))
+
+@lru_cache(maxsize=None)
+def list_root_entries(project_path: Path) -> Set[str]:
+    """List the names in the project root with a single directory read."""
+    try:
+        with os.scandir(project_path) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
 
 
 def detect_package_manager(project_path: Path) -> str:
     """Detect the package manager in use."""
+    names = list_root_entries(project_path)
     for file, manager in DEPENDENCY_FILES.items():
-        if (project_path / file).exists():
+        if file in names:
             return manager
     return 'Unknown'
 
@@ -294,13 +320,14 @@ def analyze_project(project_path: Path) -> Dict:
     }
 
     # Parse dependencies based on package manager
-    if (project_path / 'package.json').exists():
+    names = list_root_entries(project_path)
+    if 'package.json' in names:
         result['dependencies'] = parse_package_json(project_path / 'package.json')
-    elif (project_path / 'requirements.txt').exists():
+    elif 'requirements.txt' in names:
         result['dependencies'] = parse_requirements_txt(project_path / 'requirements.txt')
-    elif (project_path / 'go.mod').exists():
+    elif 'go.mod' in names:
         result['dependencies'] = parse_go_mod(project_path / 'go.mod')
-    elif (project_path / 'Cargo.toml').exists():
+    elif 'Cargo.toml' in names:
         result['dependencies'] = parse_cargo_toml(project_path / 'Cargo.toml')
 
     # Detect frameworks
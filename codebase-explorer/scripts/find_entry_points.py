@@ -12,11 +12,18 @@ Usage:
     find_entry_points.py [project_path]
 """
 
+import fnmatch
+import hashlib
+import json
+import mmap
 import os
 import sys
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 
 # Common entry point file patterns
@@ -72,162 +79,506 @@ CONFIG_PATTERNS = {
 }
 
 
-def find_files_by_pattern(project_path: Path, patterns: List[str]) -> List[Path]:
-    """Find files matching glob patterns."""
+# Route definition file patterns
+ROUTE_PATTERNS = {
+    'Route definitions': [
+        # Python
+        'routes.py', 'urls.py', 'views.py', 'app/routes.py',
+        # JavaScript/TypeScript
+        'routes.js', 'routes.ts', 'router.js', 'router.ts',
+        # Next.js
+        'pages/**/*.js', 'pages/**/*.tsx', 'app/**/page.js', 'app/**/page.tsx',
+        # Nuxt
+        'pages/**/*.vue',
+        # React Router
+        '**/routes.js', '**/routes.tsx',
+        # Vue Router
+        'router/*.js', 'router/*.ts',
+    ],
+}
+
+
+# Every result section and its categories, in report order
+PATTERN_SECTIONS = {
+    'entry_points': {
+        f"{category} - {subcategory}": file_patterns
+        for category, patterns in ENTRY_POINT_PATTERNS.items()
+        for subcategory, file_patterns in patterns.items()
+    },
+    'config_files': CONFIG_PATTERNS,
+    'routes': ROUTE_PATTERNS,
+}
+
+
+def _build_pattern_index() -> Dict[str, List[Tuple[str, str]]]:
+    """Map each distinct glob to the (section, category) pairs that use it."""
+    index = {}
+    for section, categories in PATTERN_SECTIONS.items():
+        for category, patterns in categories.items():
+            for pattern in patterns:
+                index.setdefault(pattern, []).append((section, category))
+    return index
+
+
+# Reverse index so patterns shared between categories are only matched once
+ALL_PATTERNS = _build_pattern_index()
+
+
+def _has_magic(pattern: str) -> bool:
+    """Check whether a glob component contains wildcard characters."""
+    return any(c in pattern for c in '*?[')
+
+
+# Every basename glob compiled into one alternation, used to pick out the
+# few basenames worth testing against the individual globs
+NAME_GLOB_RE = re.compile('|'.join(
+    f'(?:{fnmatch.translate(name)})'
+    for name in dict.fromkeys(pattern.rpartition('/')[2] for pattern in ALL_PATTERNS)
+    if _has_magic(name)
+))
+
+
+# Python Flask/Django/FastAPI endpoint definitions, unioned into one scan
+PY_ENDPOINT_RE = re.compile(b'|'.join([
+    rb'@(?:app|bp)\.route\([\'"](?P<route>[^\'"]+)[\'"]',
+    rb'@(?:router|api)\.(?:get|post|put|delete|patch)\([\'"](?P<decorator>[^\'"]+)[\'"]',
+    rb'path\([\'"](?P<django_path>[^\'"]+)[\'"]',
+    rb'url\(r[\'"](?P<django_url>[^\'"]+)[\'"]',
+]))
+
+# JavaScript/TypeScript Express endpoint definitions
+JS_ENDPOINT_RE = re.compile(
+    rb'(?:app|router)\.(?P<method>get|post|put|delete|patch)\([\'"](?P<path>[^\'"]+)[\'"]'
+)
+
+
+# Route files smaller than this are read outright instead of memory-mapped
+MMAP_MIN_SIZE = 4096
+
+# Route files are only scanned for endpoints if they are source files of at
+# most this size; larger ones are usually generated bundles
+ENDPOINT_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.tsx', '.jsx', '.vue'})
+MAX_ENDPOINT_FILE_SIZE = 500 << 10
+
+
+# Dependency, VCS, cache and build output directories never searched
+IGNORED_DIRS = frozenset({
+    '.git', 'node_modules', '.venv', 'venv', '__pycache__', 'dist', 'build',
+    '.next', '.nuxt', 'target', '.mypy_cache', '.pytest_cache',
+})
+
+
+# Top-level subdirectories are walked on a thread pool above this count
+PARALLEL_MIN_SUBDIRS = 4
+
+
+SNAPSHOT_CACHE_DIR = Path(
+    os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+) / 'find_entry_points'
+
+# Bump when IGNORED_DIRS or the snapshot layout changes
+SNAPSHOT_CACHE_VERSION = 2
+
+# A directory modified this recently is "racily clean": an entry added in
+# the same timestamp tick, after it was listed, would leave its mtime
+# unchanged. Such directories are recorded without an mtime, so the next
+# run lists them again.
+RACY_WINDOW_NS = 2 * 10**9
+
+
+def _is_ignored(entry: os.DirEntry) -> bool:
+    """Check the name first so only ignored-looking entries pay for is_dir()."""
+    return entry.name in IGNORED_DIRS and entry.is_dir()
+
+
+def _stable_mtime(path: str) -> Optional[int]:
+    """Return the mtime of path, or None if it is too recent to trust."""
+    mtime = os.stat(path).st_mtime_ns
+    return mtime if mtime < time.time_ns() - RACY_WINDOW_NS else None
+
+
+def _walk_subtree(
+    project_path: Path, rel_dir: str
+) -> Tuple[List[Tuple[str, str]], Dict[str, Optional[int]]]:
+    """
+    Walk one top-level directory.
+
+    Returns the (basename, relative path) pairs found under it and the
+    mtime of every directory visited (None if racily clean), keyed by
+    relative path.
+    """
+    entries = []
+    dir_mtimes = {}
+    stack = [rel_dir]
+
+    while stack:
+        rel_root = stack.pop()
+        root = os.path.join(project_path, rel_root)
+        try:
+            # Stat before listing so a concurrent change invalidates the cache
+            dir_mtimes[rel_root] = _stable_mtime(root)
+            with os.scandir(root) as it:
+                children = list(it)
+        except OSError:
+            continue
+
+        for entry in children:
+            if _is_ignored(entry):
+                continue
+            rel_path = os.path.join(rel_root, entry.name)
+            entries.append((entry.name, rel_path))
+            # d_type from getdents answers this without a stat per entry
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(rel_path)
+
+    return entries, dir_mtimes
+
+
+def _walk_tree(
+    project_path: Path
+) -> Tuple[Dict[str, List[str]], Dict[str, Optional[int]]]:
+    """
+    Walk the project, returning the basename snapshot and directory mtimes.
+
+    Directories in IGNORED_DIRS are pruned during the walk, and top-level
+    subdirectories are walked concurrently; the GIL is released during the
+    scandir/stat syscalls, so threads are enough.
+    """
+    snapshot = {}
+    subdirs = []
+
+    try:
+        dir_mtimes = {'': _stable_mtime(project_path)}
+        with os.scandir(project_path) as it:
+            top_level = list(it)
+    except OSError:
+        return snapshot, {}
+
+    for entry in top_level:
+        if _is_ignored(entry):
+            continue
+        snapshot.setdefault(entry.name, []).append(entry.name)
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.name)
+
+    if len(subdirs) > PARALLEL_MIN_SUBDIRS:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            batches = list(executor.map(lambda d: _walk_subtree(project_path, d), subdirs))
+    else:
+        batches = [_walk_subtree(project_path, d) for d in subdirs]
+
+    for batch, batch_mtimes in batches:
+        for name, rel_path in batch:
+            snapshot.setdefault(name, []).append(rel_path)
+        dir_mtimes.update(batch_mtimes)
+
+    return snapshot, dir_mtimes
+
+
+def _snapshot_cache_file(project_path: str) -> Path:
+    digest = hashlib.sha1(project_path.encode('utf-8', 'surrogateescape')).hexdigest()
+    return SNAPSHOT_CACHE_DIR / f'{digest}.json'
+
+
+def load_snapshot_cache(project_path: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Load the snapshot saved by a previous run, if the tree is unchanged.
+
+    Adding, removing or renaming an entry updates its parent directory's
+    mtime, so the snapshot is still valid as long as every directory it
+    visited keeps the mtime recorded when it was walked. Directories
+    recorded without an mtime (see RACY_WINDOW_NS) always fail the check.
+    """
+    try:
+        with open(_snapshot_cache_file(project_path), 'rb') as f:
+            data = json.load(f)
+        if data.get('version') != SNAPSHOT_CACHE_VERSION:
+            return None
+        for rel_dir, mtime in data['dirs'].items():
+            if mtime is None or os.stat(os.path.join(project_path, rel_dir)).st_mtime_ns != mtime:
+                return None
+        return data['snapshot']
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def save_snapshot_cache(
+    project_path: str,
+    snapshot: Dict[str, List[str]],
+    dir_mtimes: Dict[str, Optional[int]]
+) -> None:
+    """Atomically write the snapshot and its directory mtimes to the cache."""
+    cache_file = _snapshot_cache_file(project_path)
+    tmp_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.tmp')
+    data = {'version': SNAPSHOT_CACHE_VERSION, 'dirs': dir_mtimes, 'snapshot': snapshot}
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=8)
+def _snapshot(project_path: str, root_mtime_ns: int) -> Dict[str, List[str]]:
+    """Memoized snapshot of a project, keyed by its root directory mtime."""
+    snapshot = load_snapshot_cache(project_path)
+    if snapshot is None:
+        snapshot, dir_mtimes = _walk_tree(Path(project_path))
+        if dir_mtimes:
+            save_snapshot_cache(project_path, snapshot, dir_mtimes)
+    return snapshot
+
+
+def scan_tree(project_path: Path) -> Dict[str, List[str]]:
+    """
+    Walk the project once and index every file and directory by basename.
+
+    Returns a dict mapping each basename to the paths (relative to the
+    project root) that carry it, so patterns can be matched without
+    re-walking the tree. Snapshots are memoized per root mtime within a
+    process and reused across runs while no walked directory has changed.
+    The returned dict is shared and must not be modified.
+    """
+    try:
+        root_mtime_ns = os.stat(project_path).st_mtime_ns
+    except OSError:
+        return {}
+    return _snapshot(os.path.abspath(project_path), root_mtime_ns)
+
+
+def _match_dir_parts(parts: List[str], patterns: List[str]) -> bool:
+    """Match directory components against glob components ('**' spans any depth)."""
+    if not patterns:
+        return not parts
+    if patterns[0] == '**':
+        return any(_match_dir_parts(parts[i:], patterns[1:]) for i in range(len(parts) + 1))
+    return (
+        bool(parts)
+        and fnmatch.fnmatch(parts[0], patterns[0])
+        and _match_dir_parts(parts[1:], patterns[1:])
+    )
+
+
+def _match_pattern(
+    pattern: str,
+    snapshot: Dict[str, List[str]],
+    glob_names: List[str] = None
+) -> List[str]:
+    """
+    Find the snapshot entries (relative paths) matching a single glob pattern.
+
+    glob_names optionally narrows the basenames tested against wildcard
+    patterns (see NAME_GLOB_RE).
+    """
     found = []
+    dir_pattern, _, name_pattern = pattern.rpartition('/')
 
+    # Literal names are a single lookup; globs are matched per basename
+    if _has_magic(name_pattern):
+        names = fnmatch.filter(snapshot if glob_names is None else glob_names, name_pattern)
+    else:
+        names = [name_pattern] if name_pattern in snapshot else []
+
+    for name in names:
+        for rel_path in snapshot[name]:
+            # Patterns with a directory part (e.g. 'src/index.js') are
+            # anchored at the project root; bare names match at any depth
+            if dir_pattern:
+                rel_dir = os.path.dirname(rel_path)
+                parts = rel_dir.split(os.sep) if rel_dir else []
+                if not _match_dir_parts(parts, dir_pattern.split('/')):
+                    continue
+            found.append(rel_path)
+
+    return found
+
+
+def _sorted_paths(paths: Iterable[str]) -> List[str]:
+    """Sort unique relative paths component-wise, like Path ordering."""
+    return sorted(paths, key=lambda path: path.split(os.sep))
+
+
+def find_files_by_pattern(
+    project_path: Path,
+    patterns: List[str],
+    snapshot: Dict[str, List[str]] = None
+) -> List[str]:
+    """Find files matching glob patterns, as paths relative to the project."""
+    if snapshot is None:
+        snapshot = scan_tree(project_path)
+
+    # Each pattern yields unique paths, but patterns can overlap; a dict
+    # keyed by path drops repeats as they are collected
+    found = {}
     for pattern in patterns:
-        # Handle patterns with directory structure
-        if '/' in pattern:
-            # Pattern includes directory (e.g., 'src/index.js')
-            parts = pattern.split('/')
-            base_pattern = '/'.join(parts[:-1])
-            file_pattern = parts[-1]
-
-            base_dir = project_path
-            for part in base_pattern.split('/'):
-                if part == '*':
-                    # Wildcard directory
-                    if base_dir.exists() and base_dir.is_dir():
-                        matching_dirs = [d for d in base_dir.iterdir() if d.is_dir()]
-                        for md in matching_dirs:
-                            found.extend(md.glob(file_pattern))
-                    break
-                else:
-                    base_dir = base_dir / part
-                    if not base_dir.exists():
-                        break
-            else:
-                if base_dir.exists():
-                    found.extend(base_dir.glob(file_pattern))
-        else:
-            # Simple file pattern
-            found.extend(project_path.rglob(pattern))
-
-    return sorted(set(found))
-
-
-def find_entry_points(project_path: Path) -> Dict[str, List[Path]]:
-    """Find entry points in the project."""
-    entry_points = {}
+        found.update(dict.fromkeys(_match_pattern(pattern, snapshot)))
+
+    return _sorted_paths(found)
+
+
+def classify_files(
+    project_path: Path,
+    snapshot: Dict[str, List[str]] = None,
+    sections: List[str] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Match every distinct pattern once and bucket the results by category.
+
+    Returns {section: {category: files}} for the requested sections of
+    PATTERN_SECTIONS (all by default), keeping only non-empty categories.
+    Files are paths relative to the project root.
+    """
+    if snapshot is None:
+        snapshot = scan_tree(project_path)
+    if sections is None:
+        sections = list(PATTERN_SECTIONS)
+
+    # Pre-seed categories so results keep the declared report order
+    results = {
+        section: {category: {} for category in PATTERN_SECTIONS[section]}
+        for section in sections
+    }
+
+    # One regex step per basename rejects everything no glob can match;
+    # several globs may match the same name, so survivors are re-tested
+    glob_names = [name for name in snapshot if NAME_GLOB_RE.match(name)]
 
-    for category, patterns in ENTRY_POINT_PATTERNS.items():
-        for subcategory, file_patterns in patterns.items():
-            key = f"{category} - {subcategory}"
-            found = find_files_by_pattern(project_path, file_patterns)
-            if found:
-                entry_points[key] = found
+    for pattern, targets in ALL_PATTERNS.items():
+        targets = [(section, category) for section, category in targets if section in results]
+        if not targets:
+            continue
+        found = _match_pattern(pattern, snapshot, glob_names)
+        for section, category in targets:
+            results[section][category].update(dict.fromkeys(found))
 
-    return entry_points
+    return {
+        section: {category: _sorted_paths(found) for category, found in categories.items() if found}
+        for section, categories in results.items()
+    }
 
 
-def find_config_files(project_path: Path) -> Dict[str, List[Path]]:
-    """Find configuration files in the project."""
-    config_files = {}
+def find_entry_points(
+    project_path: Path,
+    snapshot: Dict[str, List[str]] = None
+) -> Dict[str, List[str]]:
+    """Find entry points in the project."""
+    return classify_files(project_path, snapshot, ['entry_points'])['entry_points']
 
-    for category, patterns in CONFIG_PATTERNS.items():
-        found = find_files_by_pattern(project_path, patterns)
-        if found:
-            config_files[category] = found
 
-    return config_files
+def find_config_files(
+    project_path: Path,
+    snapshot: Dict[str, List[str]] = None
+) -> Dict[str, List[str]]:
+    """Find configuration files in the project."""
+    return classify_files(project_path, snapshot, ['config_files'])['config_files']
 
 
-def find_routes(project_path: Path) -> Dict[str, List[Path]]:
+def find_routes(
+    project_path: Path,
+    snapshot: Dict[str, List[str]] = None
+) -> Dict[str, List[str]]:
     """Find route definition files."""
-    routes = {}
+    return classify_files(project_path, snapshot, ['routes'])['routes']
 
-    # Common route file patterns
-    route_patterns = [
-        # Python
-        'routes.py', 'urls.py', 'views.py', 'app/routes.py',
-        # JavaScript/TypeScript
-        'routes.js', 'routes.ts', 'router.js', 'router.ts',
-        # Next.js
-        'pages/**/*.js', 'pages/**/*.tsx', 'app/**/page.js', 'app/**/page.tsx',
-        # Nuxt
-        'pages/**/*.vue',
-        # React Router
-        '**/routes.js', '**/routes.tsx',
-        # Vue Router
-        'router/*.js', 'router/*.ts',
-    ]
 
-    found = find_files_by_pattern(project_path, route_patterns)
-    if found:
-        routes['Route definitions'] = found
+def _scan_endpoints(content: bytes, source: str) -> List[Dict[str, str]]:
+    """Scan raw file content for endpoint definitions."""
+    endpoints = []
+
+    # Python Flask/Django/FastAPI patterns; the path is always the last
+    # group of each alternative, so m.lastgroup names it
+    for match in PY_ENDPOINT_RE.finditer(content):
+        endpoints.append({
+            'method': 'GET',  # Default, could be refined
+            'path': match.group(match.lastgroup).decode('utf-8', 'ignore'),
+            'source': source,
+        })
+
+    # JavaScript/TypeScript Express patterns
+    for match in JS_ENDPOINT_RE.finditer(content):
+        endpoints.append({
+            'method': match.group('method').decode('ascii').upper(),
+            'path': match.group('path').decode('utf-8', 'ignore'),
+            'source': source,
+        })
 
-    return routes
+    return endpoints
 
 
 def find_api_endpoints(file_path: Path) -> List[Dict[str, str]]:
     """Extract API endpoint definitions from code files."""
-    endpoints = []
+    if file_path.suffix not in ENDPOINT_EXTENSIONS:
+        return []
 
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-
-        # Python Flask/Django/FastAPI patterns
-        python_patterns = [
-            r'@app\.route\([\'"]([^\'"]+)[\'"]',
-            r'@bp\.route\([\'"]([^\'"]+)[\'"]',
-            r'@router\.(get|post|put|delete|patch)\([\'"]([^\'"]+)[\'"]',
-            r'@api\.(get|post|put|delete|patch)\([\'"]([^\'"]+)[\'"]',
-            r'path\([\'"]([^\'"]+)[\'"]',
-            r'url\(r[\'"]([^\'"]+)[\'"]',
-        ]
-
-        for pattern in python_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                if isinstance(match, tuple):
-                    endpoint = match[1] if len(match) > 1 else match[0]
-                else:
-                    endpoint = match
-                endpoints.append({
-                    'method': 'GET',  # Default, could be refined
-                    'path': endpoint,
-                    'source': str(file_path.relative_to(file_path.parents[-2])),
-                })
-
-        # JavaScript/TypeScript Express patterns
-        js_patterns = [
-            r'app\.(get|post|put|delete|patch)\([\'"]([^\'"]+)[\'"]',
-            r'router\.(get|post|put|delete|patch)\([\'"]([^\'"]+)[\'"]',
-        ]
-
-        for pattern in js_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                method = match[0].upper()
-                path = match[1]
-                endpoints.append({
-                    'method': method,
-                    'path': path,
-                    'source': str(file_path.relative_to(file_path.parents[-2])),
-                })
-
+        size = os.stat(file_path).st_size
+        if size > MAX_ENDPOINT_FILE_SIZE:
+            return []
+
+        # Computed once per file rather than once per matched endpoint
+        source = str(file_path.relative_to(file_path.parents[-2]))
+
+        with open(file_path, 'rb') as f:
+            # Map larger files so the regexes scan the page cache directly,
+            # without decoding the whole file into a str
+            if size >= MMAP_MIN_SIZE:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return _scan_endpoints(mm, source)
+                except ValueError:
+                    pass  # File was truncated to empty since the size check
+            return _scan_endpoints(f.read(), source)
     except Exception:
-        pass
-
-    return endpoints
+        return []
 
 
-def analyze_routes(project_path: Path, route_files: List[Path]) -> Dict:
+def analyze_routes(project_path: Path, route_files: List[str]) -> Dict:
     """Analyze route files and extract endpoints."""
     endpoints = []
+    truncated = False
 
-    for file_path in route_files[:10]:  # Limit to first 10 files
-        file_endpoints = find_api_endpoints(file_path)
+    files = route_files[:10]  # Limit to first 10 files
+    for index, file_path in enumerate(files):
+        file_endpoints = find_api_endpoints(project_path / file_path)
         endpoints.extend(file_endpoints)
+        # Only the first 20 are returned, so stop reading further files;
+        # the total is only a lower bound if some were left unread
+        if len(endpoints) >= 20:
+            truncated = index < len(files) - 1
+            break
 
     return {
         'total': len(endpoints),
+        'truncated': truncated,  # True when 'total' is only a lower bound
         'endpoints': endpoints[:20],  # Return first 20
     }
 
 
+def write_json(output_file: Path, data: Dict) -> None:
+    """Write data as indented JSON, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        try:
+            output_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            return
+        except orjson.JSONEncodeError:
+            pass
+
+    # Write UTF-8 unescaped, byte-for-byte like orjson; lone surrogates from
+    # undecodable file names become \udcXX escapes, as json would write them
+    with open(output_file, 'w', encoding='utf-8', errors='backslashreplace') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: find_entry_points.py [project_path]")
@@ -241,8 +592,11 @@ def main():
 
     print(f"🎯 Finding entry points: {project_path}\n")
 
+    # Walk the project once and match every distinct pattern once
+    found = classify_files(project_path)
+
     # Find entry points
-    entry_points = find_entry_points(project_path)
+    entry_points = found['entry_points']
 
     print("=" * 60)
     print("ENTRY POINTS")
@@ -251,13 +605,12 @@ def main():
         for category, files in entry_points.items():
             print(f"\n{category}:")
             for file in files:
-                rel_path = file.relative_to(project_path)
-                print(f"  • {rel_path}")
+                print(f"  • {file}")
     else:
         print("  No entry points detected")
 
     # Find config files
-    config_files = find_config_files(project_path)
+    config_files = found['config_files']
 
     print("\n" + "=" * 60)
     print("CONFIGURATION FILES")
@@ -266,15 +619,14 @@ def main():
         for category, files in config_files.items():
             print(f"\n{category}:")
             for file in files[:5]:  # Limit to 5 per category
-                rel_path = file.relative_to(project_path)
-                print(f"  • {rel_path}")
+                print(f"  • {file}")
             if len(files) > 5:
                 print(f"  ... and {len(files) - 5} more")
     else:
         print("  No config files detected")
 
     # Find routes
-    routes = find_routes(project_path)
+    routes = found['routes']
 
     print("\n" + "=" * 60)
     print("ROUTE DEFINITIONS")
@@ -283,8 +635,7 @@ def main():
         for category, files in routes.items():
             print(f"\n{category}:")
             for file in files[:10]:  # Limit to 10
-                rel_path = file.relative_to(project_path)
-                print(f"  • {rel_path}")
+                print(f"  • {file}")
             if len(files) > 10:
                 print(f"  ... and {len(files) - 10} more")
 
@@ -293,7 +644,8 @@ def main():
         endpoints_info = analyze_routes(project_path, route_files)
 
         if endpoints_info['endpoints']:
-            print(f"\nDetected API Endpoints ({endpoints_info['total']} total, showing first 20):")
+            total = f"{endpoints_info['total']}{'+' if endpoints_info['truncated'] else ''}"
+            print(f"\nDetected API Endpoints ({total} total, showing first 20):")
             for ep in endpoints_info['endpoints']:
                 print(f"  {ep['method']} {ep['path']}")
                 print(f"    → {ep['source']}")
@@ -302,13 +654,13 @@ def main():
 
     # Save to JSON
     output_file = project_path / '.codebase-entry-points.json'
-    import json
-    with open(output_file, 'w') as f:
-        json.dump({
-            'entry_points': {k: [str(v) for v in vals] for k, vals in entry_points.items()},
-            'config_files': {k: [str(v) for v in vals] for k, vals in config_files.items()},
-            'routes': {k: [str(v) for v in vals] for k, vals in routes.items()},
-        }, f, indent=2)
+    write_json(output_file, {
+        section: {
+            category: [os.path.join(project_path, file) for file in files]
+            for category, files in categories.items()
+        }
+        for section, categories in found.items()
+    })
 
     print(f"\n✅ Entry points saved to: {output_file}")
 
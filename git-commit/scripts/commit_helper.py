@@ -7,10 +7,37 @@ Automatically generates standardized commit messages based on staged changes.
 import subprocess
 import sys
 import os
-from typing import Dict, List, Tuple
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Diff keywords that suggest a bug fix or a refactor (matched lowercase)
+FIX_KEYWORDS = ('fix', 'error', 'null', 'exception')
+REFACTOR_KEYWORDS = ('refactor', 'cleanup', 'reorganize')
+
+# Top-level directories too generic to use as a commit scope
+SCOPE_SKIP_DIRS = frozenset({'src', 'lib', 'test', 'tests', 'docs'})
+
+# Staged (index) status codes from `git status --porcelain=v2`, which match
+# the libgit2 delta status characters
+STAGED_STATUS_CATEGORIES = {
+    'A': 'added',
+    'C': 'added',
+    'M': 'modified',
+    'T': 'modified',
+    'D': 'deleted',
+    'R': 'renamed',
+}
 
 class GitCommitHelper:
     def __init__(self):
+        # In-process libgit2 handle for read-only queries, when available
+        self.repo = self._open_repository()
+        self._index_diff = None
         self.commit_types = {
             'feat': 'A new feature',
             'fix': 'A bug fix',
@@ -21,21 +48,38 @@ class GitCommitHelper:
             'chore': 'Maintenance tasks, build process, dependencies'
         }
 
-    def run_git_command(self, command: List[str]) -> Tuple[bool, str]:
+    def _open_repository(self):
+        """Open the current repository with pygit2, or None if unavailable."""
+        if pygit2 is None:
+            return None
+        try:
+            path = pygit2.discover_repository(os.getcwd())
+            return pygit2.Repository(path) if path else None
+        except pygit2.GitError:
+            return None
+
+    def run_git_command(self, command: List[str], strip: bool = True) -> Tuple[bool, str]:
         """Execute a git command and return success status and output."""
         try:
+            # Read-only queries must not take the optional index refresh lock.
+            # -z output carries raw path bytes, which need not be UTF-8.
             result = subprocess.run(
-                ['git'] + command,
+                ['git', '--no-optional-locks'] + command,
                 capture_output=True,
                 text=True,
+                errors='surrogateescape',
                 check=True
             )
-            return True, result.stdout.strip()
+            return True, result.stdout.strip() if strip else result.stdout
         except subprocess.CalledProcessError as e:
             return False, e.stderr.strip()
 
-    def get_staged_changes(self) -> Dict[str, List[str]]:
-        """Get detailed information about staged changes."""
+    def get_staged_changes(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Get detailed information about staged changes.
+
+        Returns None outside a git repository, where git status fails.
+        """
         changes = {
             'added': [],
             'modified': [],
@@ -43,32 +87,79 @@ class GitCommitHelper:
             'renamed': []
         }
 
-        # Get staged files status
-        success, status_output = self.run_git_command(['status', '--porcelain'])
-        if not success:
-            return changes
+        if self.repo is not None and not self.repo.head_is_unborn:
+            try:
+                return self._get_index_changes(changes)
+            except pygit2.GitError:
+                pass
 
-        for line in status_output.split('\n'):
-            if not line.strip():
+        # Porcelain v2 records are NUL-terminated with unquoted paths
+        success, status_output = self.run_git_command(
+            ['status', '--porcelain=v2', '-z'], strip=False
+        )
+        if not success:
+            return None
+
+        records = iter(status_output.split('\0'))
+        for record in records:
+            kind = record[:1]
+            if kind == '1':
+                # 1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+                fields = record.split(' ', 8)
+            elif kind == '2':
+                # 2 <XY> ... <Xscore> <path>, then <origPath> as its own record
+                fields = record.split(' ', 9)
+                next(records, None)
+            else:
+                # Untracked, ignored and unmerged entries are not staged changes
                 continue
 
-            status = line[:2].strip()
-            filename = line[3:].strip()
+            # X is the staged (index) side of XY; '.' means unchanged
+            category = STAGED_STATUS_CATEGORIES.get(fields[1][0])
+            if category:
+                changes[category].append(fields[-1])
 
-            if status == 'A' or status.startswith('A'):
-                changes['added'].append(filename)
-            elif status == 'M' or status.startswith('M'):
-                changes['modified'].append(filename)
-            elif status == 'D' or status.startswith('D'):
-                changes['deleted'].append(filename)
-            elif status == 'R' or status.startswith('R'):
-                changes['renamed'].append(filename)
+        return changes
+
+    def _get_index_changes(self, changes: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Classify staged changes from the HEAD-to-index diff computed by libgit2."""
+        statuses = {}
+        for delta in self._get_index_diff().deltas:
+            path = delta.new_file.path
+            status = delta.status_char()
+            # A type change (e.g. file to symlink) comes back as a delete
+            # and an add of the same path; git status reports it as T
+            if {status, statuses.get(path)} == {'A', 'D'}:
+                status = 'T'
+            statuses[path] = status
+
+        for path, status in statuses.items():
+            category = STAGED_STATUS_CATEGORIES.get(status)
+            if category:
+                changes[category].append(path)
 
         return changes
 
+    def _get_index_diff(self):
+        """Build the HEAD-to-index diff once, shared by changes and patch text."""
+        if self._index_diff is None:
+            # Only changed lines are analyzed, so skip context lines
+            diff = self.repo.diff('HEAD', cached=True, context_lines=0)
+            # Pair deleted and added paths into renames, as git does
+            diff.find_similar(flags=pygit2.GIT_DIFF_FIND_RENAMES)
+            self._index_diff = diff
+        return self._index_diff
+
     def get_staged_diff(self) -> str:
         """Get the diff of staged changes."""
-        success, diff_output = self.run_git_command(['diff', '--staged'])
+        if self.repo is not None and not self.repo.head_is_unborn:
+            try:
+                return (self._get_index_diff().patch or '').strip()
+            except pygit2.GitError:
+                pass
+
+        # Only changed lines are analyzed, so skip context lines
+        success, diff_output = self.run_git_command(['diff', '--staged', '-U0', '--no-color'])
         if not success:
             return ""
         return diff_output
@@ -82,27 +173,28 @@ class GitCommitHelper:
             'details': []
         }
 
-        # Analyze file patterns to determine scope
-        scopes = []
+        # Analyze file patterns to determine scope: the first meaningful
+        # directory of each changed file
+        scopes = Counter()
         for files in changes.values():
             for file_path in files:
-                # Extract directory/scope from file path
                 dir_name = os.path.dirname(file_path)
                 if dir_name and dir_name != '.':
-                    # Take the first meaningful directory as scope
-                    scope_candidate = dir_name.split('/')[0]
-                    if scope_candidate not in ['src', 'lib', 'test', 'tests', 'docs']:
-                        scopes.append(scope_candidate)
+                    scope_candidate = dir_name.split('/', 1)[0]
+                    if scope_candidate not in SCOPE_SKIP_DIRS:
+                        scopes[scope_candidate] += 1
 
         # Determine scope (most common or specific)
         if scopes:
-            # Get most frequent scope
-            analysis['scope'] = max(set(scopes), key=scopes.count)
+            analysis['scope'] = scopes.most_common(1)[0][0]
 
         # Determine type based on file patterns and diff content
         all_files = (changes['added'] + changes['modified'] +
                     changes['deleted'] + changes['renamed'])
 
+        # Lowercase the (possibly large) diff once for all keyword checks
+        diff_lower = diff.lower()
+
         # Check for test files
         if any('test' in f.lower() or 'spec' in f.lower() for f in all_files):
             analysis['type'] = 'test'
@@ -116,13 +208,11 @@ class GitCommitHelper:
             analysis['type'] = 'feat'
 
         # Check for bug fixes (error handling, null checks, etc)
-        elif ('fix' in diff.lower() or 'error' in diff.lower() or
-              'null' in diff.lower() or 'exception' in diff.lower()):
+        elif any(keyword in diff_lower for keyword in FIX_KEYWORDS):
             analysis['type'] = 'fix'
 
         # Check for refactoring (structural changes without new features)
-        elif ('refactor' in diff.lower() or 'cleanup' in diff.lower() or
-              'reorganize' in diff.lower()):
+        elif any(keyword in diff_lower for keyword in REFACTOR_KEYWORDS):
             analysis['type'] = 'refactor'
 
         # Generate description based on changes
@@ -172,14 +262,12 @@ def main():
     """Main function to execute the git commit workflow."""
     helper = GitCommitHelper()
 
-    # Check if we're in a git repository
-    success, _ = helper.run_git_command(['rev-parse', '--git-dir'])
-    if not success:
+    # Check for staged changes; this also detects a missing repository
+    changes = helper.get_staged_changes()
+    if changes is None:
         print("Error: Not a git repository")
         sys.exit(1)
 
-    # Check for staged changes
-    changes = helper.get_staged_changes()
     total_changes = sum(len(files) for files in changes.values())
 
     if total_changes == 0: